@@ -39,8 +39,10 @@ class SCDataBroker:
             self._em = EntityManager(logger, database_path)
         self._scapi = SCApi(config.sc_api_key, logger)
         self._data_provider_manager = DataProviderManager()
+        # fetch all update dates in one query instead of one per data type
+        loaddates = self._em.get_loaddates()
         ship_data_provider = ShipDataProvider(
-            self._em.get_ships(), self._em.get_loaddate(UpdateType.SHIPS), logger
+            self._em.get_ships(), loaddates.get(UpdateType.SHIPS), logger
         )
         self._data_provider_manager.add_data_provider(
             DataProviderType.SHIPS,
@@ -51,7 +53,7 @@ class SCDataBroker:
             OfficialStandaloneDataProvider(
                 self._em.get_rsi_standalones(),
                 ship_data_provider,
-                self._em.get_loaddate(UpdateType.RSI_STANDALONES),
+                loaddates.get(UpdateType.RSI_STANDALONES),
                 logger,
             ),
         )
@@ -60,7 +62,7 @@ class SCDataBroker:
             OfficialUpgradeDataProvider(
                 self._em.get_rsi_upgrades(),
                 ship_data_provider,
-                self._em.get_loaddate(UpdateType.RSI_UPGRADES),
+                loaddates.get(UpdateType.RSI_UPGRADES),
                 logger,
             ),
         )
@@ -71,9 +73,9 @@ class SCDataBroker:
                 config.reddit_client_secret,
                 self._em.get_reddit_standalones() + self._em.get_reddit_upgrades(),
                 min(
-                    self._em.get_loaddate(UpdateType.REDDIT_STANDALONES)
+                    loaddates.get(UpdateType.REDDIT_STANDALONES)
                     or datetime.datetime(1900, 1, 1),
-                    self._em.get_loaddate(UpdateType.REDDIT_UPGRADES)
+                    loaddates.get(UpdateType.REDDIT_UPGRADES)
                     or datetime.datetime(1900, 1, 1),
                 ),
                 logger,
@@ -81,6 +83,18 @@ class SCDataBroker:
         )
         self._path_analyzer = PathAnalyzer(self._em, self._logger)
 
+    def close(self) -> None:
+        """
+        Closes the underlying database
+        """
+        self._em.close()
+
+    def __enter__(self) -> "SCDataBroker":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
     def complete_update(self, force: bool = False, echo: bool = False) -> None:
         """
         Forces complete update of all underlying data.
@@ -110,7 +124,10 @@ class SCDataBroker:
         )
         ships, updated = ship_data_provider.get_data(force, echo)
         if updated or force:
-            self._em.update_manufacturers([ship.manufacturer for ship in ships])
+            # ships share manufacturers, pass each one only once
+            manufacturers = {ship.manufacturer_id: ship.manufacturer for ship in ships}
+            # manufacturers are committed together with their ships
+            self._em.update_manufacturers(list(manufacturers.values()), commit=False)
             self._em.update_ships(ships)
             self._path_analyzer.update()
 
@@ -151,8 +168,12 @@ class SCDataBroker:
         if updated or force:
             standalones = []
             upgrades = []
+            # resolve all stores at once instead of querying them per entry
+            stores = self._em.find_stores(
+                (entry.store_owner, entry.store_url) for entry in entries
+            )
             for entry in entries:
-                store = self._em.find_store(entry.store_owner, entry.store_url)
+                store = stores[(entry.store_owner, entry.store_url)]
                 if entry.update_type == UpdateType.REDDIT_STANDALONES:
                     ship_id, needs_review = self._em.find_ship_id_by_name(
                         entry.ship_name
@@ -210,24 +231,26 @@ class SCDataBroker:
 
     def get_ships(self, force_update: bool = False) -> List[Ship]:
         """
-        Get ships from database after updating expired API data
+        Get ships from database, expired API data is refreshed by `complete_update`
         Args:
-            force_update: set to True to force update of underlying data
+            force_update: set to True to force update of underlying data first
 
         Returns:
             list of ships
         """
-        self._update_ships(force_update)
+        if force_update:
+            self._update_ships(force_update)
         return self._em.get_ships()
 
     def get_upgrades(self, force_update: bool = False) -> List[Upgrade]:
         """
-        Get upgrades from database after updating expired API data
+        Get upgrades from database, expired API data is refreshed by `complete_update`
         Args:
-            force_update: set to True to force update of underlying data
+            force_update: set to True to force update of underlying data first
 
         Returns:
             list of upgrades
         """
-        self._update_rsi_upgrades(force_update)
+        if force_update:
+            self._update_rsi_upgrades(force_update)
         return self._em.get_rsi_upgrades()
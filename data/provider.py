@@ -2,7 +2,7 @@
 import enum
 from abc import abstractmethod
 from datetime import timedelta, datetime
-from typing import List, Tuple, Any, Type
+from typing import List, Tuple, Any, Type, Dict
 
 from data.scraper.scraper import RSIScraper, RedditScraper
 from db.entity import Ship, Upgrade, Standalone, Base
@@ -117,7 +117,7 @@ class DataProviderManager:
     """
 
     def __init__(self):
-        self._data_providers = {}
+        self._data_providers: Dict[DataProviderType, DataProvider] = {}
 
     def get_data_provider(self, data_type: DataProviderType) -> DataProvider:
         """
@@ -128,9 +128,10 @@ class DataProviderManager:
         Returns:
 
         """
-        if data_type not in self._data_providers:
+        data_provider = self._data_providers.get(data_type)
+        if data_provider is None:
             raise ValueError(f"provider for update type {data_type} not found.")
-        return self._data_providers[data_type]
+        return data_provider
 
     # TODO: add data providers automatically on initialization
     def add_data_provider(
@@ -25,6 +25,9 @@ class ParsedRedditSubmissionEntry:
     _REGEX_QUALIFY_SIMPLE_PARSE = re.compile(r"^\s*\d[\d.,]*\s*$")
     _REGEX_PARSE_PRICE_FLOAT = re.compile(r"[^\d.]")
     _REGEX_CHECK_PRICE_STR = re.compile(r"^\d+\D?\d*$")
+    _EXCLUDE_KEYWORDS_LOWER = tuple(
+        key.lower() for key in REDDIT_PARSE_EXCLUDE_KEYWORDS
+    )
 
     @classmethod
     def _parse_price_string(cls, price_string: str) -> Optional[float]:
@@ -37,7 +40,7 @@ class ParsedRedditSubmissionEntry:
             # Do simple parse
             if cls._REGEX_QUALIFY_SIMPLE_PARSE.match(price_string) is None:
                 return None
-            parsed_string = re.sub(cls._REGEX_PARSE_PRICE_FLOAT, "", price_string)
+            parsed_string = cls._REGEX_PARSE_PRICE_FLOAT.sub("", price_string)
             if (
                 parsed_string.strip() != ""
                 and cls._REGEX_CHECK_PRICE_STR.match(parsed_string) is not None
@@ -68,9 +71,10 @@ class ParsedRedditSubmissionEntry:
         self.ship_name_from: Optional[str] = kwargs.get("ship_name_from") or None
         self.ship_name_to: Optional[str] = kwargs.get("ship_name_to") or None
         for name in [self.ship_name, self.ship_name_from, self.ship_name_to]:
-            if name is not None and any(
-                key.lower() in name.lower() for key in REDDIT_PARSE_EXCLUDE_KEYWORDS
-            ):
+            if name is None:
+                continue
+            name_lower = name.lower()
+            if any(key in name_lower for key in self._EXCLUDE_KEYWORDS_LOWER):
                 raise NotParsableException(f"[{name}] contains exclude keyword")
         if self.update_type == UpdateType.REDDIT_UPGRADES and (
             self.ship_name_from is None or self.ship_name_to is None
@@ -118,13 +122,13 @@ class _HTMLTableParser(_GenericSubmissionParser):
                 qualifier in "".join(header).lower()
                 for qualifier in self._COL_QUALIFIERS_IGNORE
             ):
-                logger.debug(f"Ignoring table based on qualifiers {'|'.join(header)}")
+                logger.debug("Ignoring table based on qualifiers %s", "|".join(header))
                 return
 
-            for i, header_item in enumerate(header):
+            for i, header_item in enumerate(item.lower() for item in header):
                 if (
                     any(
-                        qualifier in header_item.lower()
+                        qualifier in header_item
                         for qualifier in self._COL_QUALIFIERS_PRICE
                     )
                     and self.col_index_price is None
@@ -132,7 +136,7 @@ class _HTMLTableParser(_GenericSubmissionParser):
                     self.col_index_price = i
                 elif (
                     any(
-                        qualifier in header_item.lower()
+                        qualifier in header_item
                         for qualifier in self._COL_QUALIFIERS_SHIP_NAME_FROM
                     )
                     and self.col_index_ship_name_from is None
@@ -140,7 +144,7 @@ class _HTMLTableParser(_GenericSubmissionParser):
                     self.col_index_ship_name_from = i
                 elif (
                     any(
-                        qualifier in header_item.lower()
+                        qualifier in header_item
                         for qualifier in self._COL_QUALIFIERS_SHIP_NAME_TO
                     )
                     and self.col_index_ship_name_to is None
@@ -148,7 +152,7 @@ class _HTMLTableParser(_GenericSubmissionParser):
                     self.col_index_ship_name_to = i
                 elif (
                     any(
-                        qualifier in header_item.lower()
+                        qualifier in header_item
                         for qualifier in self._COL_QUALIFIERS_SHIP_NAME
                     )
                     and self.col_index_ship_name is None
@@ -164,7 +168,7 @@ class _HTMLTableParser(_GenericSubmissionParser):
                 self.type = UpdateType.REDDIT_STANDALONES
 
             if self.type is None or self.col_index_price is None:
-                logger.debug(f"Could not completely map columns {'|'.join(header)}")
+                logger.debug("Could not completely map columns %s", "|".join(header))
             else:
                 self.valid = True
 
@@ -220,10 +224,12 @@ class _HTMLTableParser(_GenericSubmissionParser):
                         # Some rows might be used as headers and can thus be ignored
                         pass
                     except NotParsableException as e:
-                        self._logger.debug(f"Entry ignored, reason: {e}")
+                        self._logger.debug("Entry ignored, reason: %s", e)
             else:
                 self._logger.debug(
-                    f"Table ignored: {'|'.join(table_header)} ({submission.shortlink})"
+                    "Table ignored: %s (%s)",
+                    "|".join(table_header),
+                    submission.shortlink,
                 )
         return parsed_submissions
 
@@ -45,7 +45,8 @@ class BaseMixin(object):
 
 class DeltaProcessedMixin(object):
     __abstract__ = True
-    loaddate = Column(DateTime)
+    # indexed for finding expired entries
+    loaddate = Column(DateTime, index=True)
 
 
 class ReviewedMixin(object):
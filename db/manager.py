@@ -1,16 +1,21 @@
 """Manager for database entities"""
+import re
 from datetime import datetime
-from typing import List, Optional, Type, Union, Tuple
+from operator import itemgetter
+from typing import List, Optional, Type, Union, Tuple, Dict, Any, Set, Iterable
 
-from fuzzywuzzy import process, fuzz
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, configure_mappers, Query
-from sqlalchemy.sql.expression import func, or_, and_, select
+from rapidfuzz import process, fuzz
+from sqlalchemy import create_engine, inspect, event, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, configure_mappers, Query, selectinload
+from sqlalchemy.pool import SingletonThreadPool
+from sqlalchemy.sql.expression import func, or_, tuple_, select
 
 from db.entity import (
     UpdateType,
     Ship,
     Base,
+    DeltaProcessedMixin,
     Manufacturer,
     Upgrade,
     Standalone,
@@ -29,19 +34,140 @@ from util.const import (
 )
 from util.helpers import CustomLogger
 
+# all entities are mapped once db.entity is imported, configure them once per process
+configure_mappers()
+
+# built once so its compiled form is reused for every lookup
+_LATEST_LOADDATE = select(func.max(UpdateLog.loaddate)).where(
+    UpdateLog.update_type == bindparam("update_type")
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, _):
+    # WAL journal with relaxed syncing avoids an fsync on every commit
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
+# fuzzywuzzy's processing of names before scoring, see `_process_ship_name`
+_NON_ALPHANUMERIC_PATTERN = re.compile(r"(?ui)\W")
+_LATIN_1_CHARACTERS = dict.fromkeys(range(128, 256))
+
+
+def _process_ship_name(s: str) -> str:
+    """
+    Prepares names for fuzzy search the same way fuzzywuzzy did, which differs from
+    RapidFuzz's `default_process` in dropping Latin-1 characters
+    Args:
+        s: name to process
+
+    Returns:
+        lowercase name with non-alphanumeric characters replaced by spaces
+    """
+    processed = _NON_ALPHANUMERIC_PATTERN.sub(" ", s).lower().strip()
+    processed = processed.translate(_LATIN_1_CHARACTERS)
+    return _NON_ALPHANUMERIC_PATTERN.sub(" ", processed).lower().strip()
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _to_mapping(entity: Base) -> Dict[str, Any]:
+    """
+    Creates mapping of column attributes to values for use in bulk operations
+    Args:
+        entity: entity to create mapping from
+
+    Returns:
+        dictionary of all column values explicitly set on the entity, like
+        `Session.merge` attributes set to None clear the column while unset attributes
+        keep their stored value, a missing primary key is left to the database
+    """
+    state = inspect(entity)
+    mapping = {}
+    for column_attr in state.mapper.column_attrs:
+        if column_attr.key in state.dict:
+            mapping[column_attr.key] = state.dict[column_attr.key]
+    if mapping.get("id") is None:
+        mapping.pop("id", None)
+    return mapping
+
 
 class EntityManager:
     """
     Manages the application's database and its entities
     """
 
+    # maps update types and entity classes to a factory for the query retrieving them,
+    # each factory receives the manager instance and the `include_unconfirmed` flag
+    _ENTITY_QUERIES = {
+        UpdateType.MANUFACTURERS: lambda self, _: self._session.query(Manufacturer),
+        Manufacturer: lambda self, _: self._session.query(Manufacturer),
+        UpdateType.SHIPS: lambda self, _: self._query_ships(),
+        Ship: lambda self, _: self._query_ships(),
+        Standalone: lambda self, _: self._session.query(Standalone),
+        Upgrade: lambda self, _: self._session.query(Upgrade),
+        UpdateType.RSI_STANDALONES: lambda self, _: self._query_rsi_standalones(),
+        UpdateType.RSI_UPGRADES: lambda self, _: self._query_rsi_upgrades(),
+        UpdateType.REDDIT_STANDALONES: lambda self, include_unconfirmed: (
+            self._query_reddit_items(Standalone, include_unconfirmed)
+        ),
+        UpdateType.REDDIT_UPGRADES: lambda self, include_unconfirmed: (
+            self._query_reddit_items(Upgrade, include_unconfirmed)
+        ),
+    }
+
+    # columns identifying entities independently of their primary key
+    _NATURAL_KEY_COLUMNS = {
+        Manufacturer: (Manufacturer.name,),
+        Ship: (Ship.name,),
+        Store: (Store.url,),
+        Standalone: (Standalone.price_usd, Standalone.store_id, Standalone.ship_id),
+        Upgrade: (
+            Upgrade.price_usd,
+            Upgrade.store_id,
+            Upgrade.ship_id_from,
+            Upgrade.ship_id_to,
+        ),
+    }
+
+    # columns compared by the entities' __eq__, used to detect unchanged entities
+    _EQUALITY_COLUMNS = {
+        Manufacturer: (Manufacturer.id, Manufacturer.name, Manufacturer.code),
+        Ship: (Ship.name, Ship.manufacturer_id),
+        Standalone: (Standalone.price_usd, Standalone.store_id, Standalone.ship_id),
+        Upgrade: (
+            Upgrade.price_usd,
+            Upgrade.store_id,
+            Upgrade.ship_id_from,
+            Upgrade.ship_id_to,
+        ),
+    }
+
+    # max rows per bulk statement, keeps lookups below SQLite's bound parameter limit
+    _BULK_CHUNK = 400
+
     def __init__(self, logger: CustomLogger, database_path: str):
-        self._engine = create_engine(f"sqlite:///{database_path}", echo=False)
-        configure_mappers()
+        # keep one connection open for the manager's lifetime instead of reconnecting
+        # for every transaction, which keeps SQLite's page cache warm
+        self._engine = create_engine(
+            f"sqlite:///{database_path}", echo=False, poolclass=SingletonThreadPool
+        )
+        event.listen(self._engine, "connect", _set_sqlite_pragmas)
         self._session = Session(bind=self._engine, expire_on_commit=False)
         self._logger = logger
+        # fuzzy ship name lookup caches, invalidated when ships are updated
+        self._resolved_ship_ids: Dict[str, Optional[Tuple[int, bool]]] = {}
+        self._ship_candidates: Optional[List[Tuple[str, int]]] = None
+        self._ship_candidate_choices: List[str] = []
+        self._shortest_ship_candidate_len = 0
         self._prepare_database()
-        self._clean_update_logs()
 
     def _prepare_database(self):
         self._logger.debug("Applying database schemata...")
@@ -51,26 +177,32 @@ class EntityManager:
         """
         Cleans all entries in update log table except for newest to save space
         """
-        self._logger.debug(f"Checking {UpdateLog.__name__} entry count...")
+        self._logger.debug("Checking %s entry count...", UpdateLog.__name__)
         log_count = self._session.query(UpdateLog).count()
         if not log_count > UPDATE_LOGS_ENTRY_LIMIT:
             self._logger.debug("Limit not exceeded, no cleanup necessary.")
             return
 
         self._logger.debug(">>> Limit exceeded, cleaning entries...")
-        for update_type in UpdateType:
-            max_loaddate_query = (
-                self._session.query(func.max(UpdateLog.loaddate))
-                .filter(UpdateLog.update_type == update_type)
-                .subquery()
+        # keep the newest entry per update type, everything else is removed at once
+        newest_loaddates = (
+            self._session.query(UpdateLog.update_type, func.max(UpdateLog.loaddate))
+            .group_by(UpdateLog.update_type)
+            .all()
+        )
+        keep_ids = [
+            row.id
+            for row in self._session.query(UpdateLog.id).filter(
+                tuple_(UpdateLog.update_type, UpdateLog.loaddate).in_(newest_loaddates)
             )
-            self._session.query(UpdateLog).filter(
-                and_(
-                    UpdateLog.update_type == update_type,
-                    UpdateLog.loaddate.not_in(select(max_loaddate_query)),
-                )
-            ).delete(synchronize_session="fetch")
-        self._session.commit()
+        ]
+        self._session.query(UpdateLog).filter(UpdateLog.id.not_in(keep_ids)).delete(
+            synchronize_session=False
+        )
+
+    def _query_ships(self) -> Query:
+        # ship representations include the manufacturer, load all of them at once
+        return self._session.query(Ship).options(selectinload(Ship.manufacturer))
 
     def _query_rsi_standalones(self) -> Query:
         return self._session.query(Standalone).filter(
@@ -98,52 +230,32 @@ class EntityManager:
         return query
 
     def _remove_stale_entities(self, update_type: UpdateType) -> None:
-        now = datetime.now()
-        deletion = []
         if update_type == UpdateType.SHIPS:
-            ships: List[Ship] = self._session.query(Ship).all()
-            deletion = [
-                ship for ship in ships if now - ship.loaddate > SHIP_DATA_EXPIRY
-            ]
+            entity_type, expiry = Ship, SHIP_DATA_EXPIRY
+            query = self._session.query(Ship)
         elif update_type == UpdateType.RSI_STANDALONES:
-            standalones: List[Standalone] = self._session.query(Standalone).all()
-            deletion = [
-                standalone
-                for standalone in standalones
-                if now - standalone.loaddate > RSI_STANDALONE_DATA_EXPIRY
-            ]
+            entity_type, expiry = Standalone, RSI_STANDALONE_DATA_EXPIRY
+            query = self._session.query(Standalone)
         elif update_type == UpdateType.RSI_UPGRADES:
-            upgrades = self._query_rsi_upgrades().all()
-            deletion = [
-                upgrade
-                for upgrade in upgrades
-                if now - upgrade.loaddate > RSI_UPGRADE_DATA_EXPIRY
-            ]
+            entity_type, expiry = Upgrade, RSI_UPGRADE_DATA_EXPIRY
+            query = self._query_rsi_upgrades()
         elif update_type == UpdateType.REDDIT_STANDALONES:
-            standalones = self._query_reddit_items(Standalone, True).all()
-            deletion = [
-                standalone
-                for standalone in standalones
-                if now - standalone.loaddate > REDDIT_DATA_EXPIRY
-            ]
+            entity_type, expiry = Standalone, REDDIT_DATA_EXPIRY
+            query = self._query_reddit_items(Standalone, True)
         elif update_type == UpdateType.REDDIT_UPGRADES:
-            upgrades = self._query_reddit_items(Upgrade, True).all()
-            deletion = [
-                upgrade
-                for upgrade in upgrades
-                if now - upgrade.loaddate > REDDIT_DATA_EXPIRY
-            ]
+            entity_type, expiry = Upgrade, REDDIT_DATA_EXPIRY
+            query = self._query_reddit_items(Upgrade, True)
         else:
             self._logger.debug(
-                f"Ignoring request to remove stale entities for type {update_type}"
+                "Ignoring request to remove stale entities for type %s", update_type
             )
             return
-        for item in deletion:
-            self._session.delete(item)
+        # let the database filter and delete expired rows instead of loading all rows,
+        # committed with the update
+        deleted_count = query.filter(
+            entity_type.loaddate < datetime.now() - expiry
+        ).delete(synchronize_session="fetch")
 
-        self._session.commit()
-
-        deleted_count = len(deletion)
         if deleted_count > 0:
             self._logger.info(
                 f"Deleted {deleted_count} stale entries for {update_type.value}"
@@ -159,47 +271,89 @@ class EntityManager:
         :return: Store instance
         :rtype: Store
         """
-        store = self._session.query(Store).filter_by(username=username, url=url).first()
-        if store is None:
-            store = Store(username=username, url=url)
-            self._session.add(store)
+        return self.find_stores([(username, url)])[(username, url)]
+
+    def find_stores(
+        self, keys: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Store]:
+        """
+        Find multiple stores at once. Create those not found.
+        Args:
+            keys: username of store owner and store URL per store
+
+        Returns:
+            stores mapped to their username and URL
+        """
+        keys = set(keys)
+        stores = {}
+        for chunk in _chunks(list(keys), self._BULK_CHUNK):
+            for store in self._session.query(Store).filter(
+                tuple_(Store.username, Store.url).in_(chunk)
+            ):
+                stores[(store.username, store.url)] = store
+        missing_keys = keys - stores.keys()
+        for username, url in missing_keys:
+            stores[(username, url)] = Store(username=username, url=url)
+            self._session.add(stores[(username, url)])
+        if len(missing_keys) > 0:
             self._session.flush()
-            self._logger.success(f"Found {store}.", CustomLogger.LEVEL_INFO)
-        return store
+            for key in missing_keys:
+                self._logger.success(f"Found {stores[key]}.", CustomLogger.LEVEL_INFO)
+        return stores
 
-    def _entity_exists(
+    def _natural_key(
         self, entity: Union[Manufacturer, Ship, Store, Standalone, Upgrade]
-    ):
-        query: Optional[Query] = None
-        if type(entity) == Manufacturer:
-            entity: Manufacturer
-            query = self._session.query(Manufacturer).filter_by(name=entity.name)
-        elif type(entity) == Ship:
-            entity: Ship
-            query = self._session.query(Ship).filter_by(name=entity.name)
-        elif type(entity) == Store:
-            entity: Store
-            query = self._session.query(Store).filter_by(url=entity.url)
-        elif type(entity) == Standalone:
-            entity: Standalone
-            query = self._session.query(Standalone).filter_by(
-                price_usd=entity.price_usd,
-                store_id=entity.store_id,
-                ship_id=entity.ship_id,
-            )
-        elif type(entity) == Upgrade:
-            entity: Upgrade
-            query = self._session.query(Upgrade).filter_by(
-                price_usd=entity.price_usd,
-                store_id=entity.store_id,
-                ship_id_from=entity.ship_id_from,
-                ship_id_to=entity.ship_id_to,
-            )
-        else:
+    ) -> Tuple:
+        """
+        Args:
+            entity: entity to create key for
+
+        Returns:
+            values identifying the entity independently of its primary key
+        """
+        columns = self._NATURAL_KEY_COLUMNS.get(type(entity))
+        if columns is None:
             raise ValueError(
-                f"{self._entity_exists.__name__} can't handle entities of type {type(entity)}!"
+                f"{self._natural_key.__name__} can't handle entities of type {type(entity)}!"
             )
-        return query.first() is not None
+        return tuple(getattr(entity, column.key) for column in columns)
+
+    def _get_natural_keys(
+        self, entity_type: Union[Type[Manufacturer], Type[Ship], Type[Store]]
+    ) -> Set[Tuple]:
+        """
+        Args:
+            entity_type: entity class to retrieve keys for
+
+        Returns:
+            natural keys of all entities of this type in database
+        """
+        columns = self._NATURAL_KEY_COLUMNS[entity_type]
+        return {tuple(row) for row in self._session.query(*columns)}
+
+    def _get_entity_keys(
+        self,
+        update_type: UpdateType,
+        entity_type: Union[
+            Type[Manufacturer], Type[Ship], Type[Standalone], Type[Upgrade]
+        ],
+    ) -> Set[Tuple]:
+        """
+        Args:
+            update_type: data type whose entities to retrieve
+            entity_type: entity class stored for this data type
+
+        Returns:
+            values compared on equality of all entities of this data type in database
+        """
+        query_factory = self._ENTITY_QUERIES.get(update_type)
+        if query_factory is None:
+            raise ValueError(f"Invalid update_type passed: {update_type}")
+        # only select the compared columns instead of loading complete entities
+        query = query_factory(self, True).with_entities(
+            *self._EQUALITY_COLUMNS[entity_type]
+        )
+        return {tuple(row) for row in query}
 
     def _update_entities(
         self,
@@ -212,29 +366,53 @@ class EntityManager:
             )
             return 0
 
+        # deduplicate by natural key instead of hashing ORM objects,
+        # raises for unsupported entities before anything is changed
+        entities_by_key = {}
+        for entity in entities:
+            entities_by_key.setdefault(self._natural_key(entity), entity)
+
         update_type_name: str = update_type.value
         self._logger.header_start(
             f"PROCESSING {update_type_name.upper()}", CustomLogger.LEVEL_INFO
         )
-        existing_entities = self._get_entities(update_type)
-        entities_set = set(entities)
-
-        # delete stale entities first (older than expiry dates defined in const.py)
-        self._remove_stale_entities(update_type)
-
-        # remove entries that are currently existing
-        cleaned_entities = [
-            entity for entity in entities_set if not self._entity_exists(entity)
-        ]
-        cleaned_count = len(entities_set) - len(cleaned_entities)
+        # probe existing entries without flushing the session before every query,
+        # pending changes are flushed once on commit
+        with self._session.no_autoflush:
+            entity_type = type(entities[0])
+            existing_entity_keys = self._get_entity_keys(update_type, entity_type)
+
+            # delete stale entities first (older than expiry dates defined in const.py)
+            self._remove_stale_entities(update_type)
+
+            # remove entries that are currently existing, fetching all existing keys
+            # at once instead of querying for every entity
+            existing_keys = self._get_natural_keys(entity_type)
+            cleaned_entities = [
+                entity
+                for key, entity in entities_by_key.items()
+                if key not in existing_keys
+            ]
+        cleaned_count = len(entities_by_key) - len(cleaned_entities)
 
-        # add or merge entities
-        total_count = 0
+        # add or update entities in bulk, updating those whose primary key is taken
+        now = datetime.now()
+        mappings = []
+        equality_columns = self._EQUALITY_COLUMNS[entity_type]
         for entity in cleaned_entities:
-            if entity not in existing_entities:
-                self._session.merge(entity)
-                self._logger.debug(f">>> Adding/updating {entity}.")
-                total_count += 1
+            entity_key = tuple(
+                getattr(entity, column.key) for column in equality_columns
+            )
+            if entity_key not in existing_entity_keys:
+                mapping = _to_mapping(entity)
+                if isinstance(entity, DeltaProcessedMixin):
+                    # bulk operations skip the mapper events setting the loaddate
+                    mapping["loaddate"] = now
+                mappings.append(mapping)
+                # formatted lazily, entity representations may load relationships
+                self._logger.debug(">>> Adding/updating %s.", entity)
+        self._upsert_mappings(entity_type, mappings)
+        total_count = len(mappings)
         if total_count > 0:
             self._logger.success(
                 f">>> Added or updated {total_count} {update_type_name}(s).",
@@ -248,41 +426,60 @@ class EntityManager:
                 f">>> {cleaned_count} already existing entries were ignored."
             )
 
-        self._session.commit()
         self._logger.header_end(CustomLogger.LEVEL_INFO)
         return total_count
 
+    def _upsert_mappings(
+        self,
+        entity_type: Union[
+            Type[Manufacturer], Type[Ship], Type[Standalone], Type[Upgrade]
+        ],
+        mappings: List[Dict[str, Any]],
+    ) -> None:
+        # the database decides between insert and update, rows sharing their set of
+        # columns are sent as one executemany
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for mapping in mappings:
+            groups.setdefault(tuple(sorted(mapping)), []).append(mapping)
+        for columns, rows in groups.items():
+            if "id" in columns:
+                # ascending keys append to the table's B-tree instead of splitting pages
+                rows.sort(key=itemgetter("id"))
+            statement = sqlite_insert(entity_type)
+            statement = statement.on_conflict_do_update(
+                index_elements=["id"],
+                set_={
+                    column: statement.excluded[column]
+                    for column in columns
+                    if column != "id"
+                },
+            )
+            for chunk in _chunks(rows, self._BULK_CHUNK):
+                self._session.execute(statement, chunk)
+        if any("id" in columns for columns in groups):
+            # upserts bypass the identity map, reload entities on next access
+            self._session.expire_all()
+
     def _get_entities(
         self, update_type: Union[UpdateType, Type[Base]], **kwargs
     ) -> List[Type[Base]]:
         include_unconfirmed: bool = kwargs.get("include_unconfirmed", True)
-        if update_type in (UpdateType.MANUFACTURERS, Manufacturer):
-            return self._session.query(Manufacturer).all()
-        elif update_type in (UpdateType.SHIPS, Ship):
-            return self._session.query(Ship).all()
-        elif update_type == Standalone:
-            return self._session.query(Standalone).all()
-        elif update_type == Upgrade:
-            return self._session.query(Upgrade).all()
-        elif update_type == UpdateType.RSI_STANDALONES:
-            return self._query_rsi_standalones().all()
-        elif update_type == UpdateType.RSI_UPGRADES:
-            return self._query_rsi_upgrades().all()
-        elif update_type == UpdateType.REDDIT_STANDALONES:
-            return self._query_reddit_items(Standalone, include_unconfirmed).all()
-        elif update_type == UpdateType.REDDIT_UPGRADES:
-            return self._query_reddit_items(Upgrade, include_unconfirmed).all()
-        else:
+        query_factory = self._ENTITY_QUERIES.get(update_type)
+        if query_factory is None:
             raise ValueError(f"Invalid update_type passed: {update_type}")
+        return query_factory(self, include_unconfirmed).all()
 
-    def update_manufacturers(self, manufacturers: List[Manufacturer]) -> int:
+    def update_manufacturers(
+        self, manufacturers: List[Manufacturer], commit: bool = True
+    ) -> int:
         """
         Inserts manufacturers into database, updates if existing
         Args:
             manufacturers: list of manufacturers to process
+            commit: False to leave committing to a following update
         """
         updated_count = self._update_entities(manufacturers, UpdateType.MANUFACTURERS)
-        self._log_update(UpdateType.MANUFACTURERS)
+        self._log_update(UpdateType.MANUFACTURERS, commit)
         return updated_count
 
     def update_ships(self, ships: List[Ship]) -> int:
@@ -292,6 +489,7 @@ class EntityManager:
             ships: list of ships to process
         """
         updated_count = self._update_entities(ships, UpdateType.SHIPS)
+        self._invalidate_ship_caches()
         self._log_update(UpdateType.SHIPS)
         return updated_count
 
@@ -337,14 +535,19 @@ class EntityManager:
         self._log_update(UpdateType.REDDIT_UPGRADES)
         return updated_count
 
-    def _log_update(self, update_type: UpdateType) -> None:
+    def _log_update(self, update_type: UpdateType, commit: bool = True) -> None:
         """
         Insert entry in log table
         Args:
             update_type: data provider type which got updated
+            commit: False to leave committing to a following update
         """
         self._session.add(UpdateLog(update_type=update_type, loaddate=datetime.now()))
-        self._session.commit()
+        # log table only grows here, so clean up here instead of on every startup
+        self._clean_update_logs()
+        if commit:
+            # single commit for the entity update, its log entry and the log cleanup
+            self._session.commit()
 
     def get_manufacturers(self) -> List[Manufacturer]:
         """
@@ -360,6 +563,16 @@ class EntityManager:
         """
         return self._get_entities(UpdateType.SHIPS)
 
+    def list_ship_rows(self) -> List[Tuple[int, str, str]]:
+        """
+        Lightweight alternative to `get_ships` for callers not needing entities
+        Returns:
+            id, name and manufacturer name of all ships in database
+        """
+        return self._session.execute(
+            select(Ship.id, Ship.name, Manufacturer.name).join(Ship.manufacturer)
+        ).all()
+
     def find_ship_id_by_name(self, name: str) -> Optional[Tuple[int, bool]]:
         """
         Tries to find ship in database using fuzzy search.
@@ -369,57 +582,99 @@ class EntityManager:
         :return: ship id and `needsreview` flag or None if not found
         :rtype: Optional[Tuple[int, bool]]
         """
-        ships: List[Ship] = self._session.query(Ship).all()
-        if ships is None or len(ships) == 0 or name == "" or name == '"':
-            return None
+        # the same names recur across many Reddit entries, only score each one once
+        if name not in self._resolved_ship_ids:
+            self._resolved_ship_ids[name] = self._resolve_ship_id_by_name(name)
+        return self._resolved_ship_ids[name]
 
-        candidate_sets = [
-            [ship.name for ship in ships],
-            [f"{ship.manufacturer.name} {ship.name}" for ship in ships],
-        ]  # try with base ship name and with manufacturer if no match found
+    def _invalidate_ship_caches(self) -> None:
+        self._resolved_ship_ids.clear()
+        self._ship_candidates = None
 
-        for candidate_set in candidate_sets:
-            results = process.extract(
-                name,
-                candidate_set,
-                scorer=fuzz.token_set_ratio,
-                limit=3,
+    def _get_ship_candidates(self) -> List[Tuple[str, int]]:
+        """
+        Builds the fuzzy search candidates, processed names are kept in the same order
+        in `_ship_candidate_choices`
+        Returns:
+            name and id of all ships, ordered by id
+        """
+        if self._ship_candidates is None:
+            self._ship_candidates = self._session.execute(
+                select(Ship.name, Ship.id).order_by(Ship.id)
+            ).all()
+            self._ship_candidate_choices = [
+                _process_ship_name(ship_name) for ship_name, _ in self._ship_candidates
+            ]
+            self._shortest_ship_candidate_len = min(
+                (len(ship_name) for ship_name, _ in self._ship_candidates), default=0
+            )
+        return self._ship_candidates
+
+    def _resolve_ship_id_by_name(self, name: str) -> Optional[Tuple[int, bool]]:
+        candidates = self._get_ship_candidates()
+        if len(candidates) == 0 or name == "" or name == '"':
+            return None
+
+        # manufacturer-prefixed names were only ever resolved through a lookup by the
+        # plain ship name, which can't succeed, so scoring the plain names is enough.
+        # No candidate can be accepted below the min score of the shortest candidate,
+        # letting RapidFuzz skip those early. Scores are rounded like fuzzywuzzy's, so
+        # the cutoff includes those rounded up to it.
+        results = process.extract(
+            _process_ship_name(name),
+            self._ship_candidate_choices,
+            scorer=fuzz.token_set_ratio,
+            processor=None,
+            limit=None,
+            score_cutoff=fuzzy_search_min_score(
+                min(len(name), self._shortest_ship_candidate_len)
             )
-            max_score = max([result[1] for result in results])
-            best_candidates = list(
-                filter(lambda c, score=max_score: c[1] == score, results)
+            - 0.5,
+        )
+        match = None
+        if len(results) > 0:
+            # the three best candidates in ship order, preferring longer names among
+            # equally scored ones
+            results = sorted(
+                ((round(score), index) for _, score, index in results),
+                key=lambda result: (-result[0], result[1]),
+            )
+            max_score = results[0][0]
+            ship_name, ship_id = max(
+                (
+                    candidates[index]
+                    for score, index in results[:3]
+                    if score == max_score
+                ),
+                key=lambda candidate: len(candidate[0]),
+            )
+            if max_score >= fuzzy_search_min_score(min(len(name), len(ship_name))):
+                match = ship_name, ship_id, max_score
+        if match is None:
+            self._logger.failure(
+                "Ship name [%s] could not be resolved to entry in database!",
+                CustomLogger.LEVEL_DEBUG,
+                name,
             )
-            best_candidates.sort(key=lambda c: len(c[0]), reverse=True)
-            result = best_candidates[0]
+            return None
 
-            if result is not None and result[1] >= fuzzy_search_min_score(
-                min(len(name), len(result[0]))
-            ):
-                ship_id = self._get_ship_id_by_name(result[0])
-                if ship_id is not None:
-                    if result[1] < FUZZY_SEARCH_PERFECT_MATCH_MIN_SCORE:
-                        self._logger.warning(
-                            f"NEEDS REVIEW: Match [{name}] -> [{result[0]}] (score {result[1]}/100)."
-                        )
-                        return ship_id, True
-                    else:
-                        self._logger.success(
-                            f"Mapped [{name}] -> [{result[0]}] (score {result[1]}/100).",
-                            CustomLogger.LEVEL_DEBUG,
-                        )
-                        return ship_id, False
-        self._logger.failure(
-            f"Ship name [{name}] could not be resolved to entry in database!",
+        ship_name, ship_id, max_score = match
+        if max_score < FUZZY_SEARCH_PERFECT_MATCH_MIN_SCORE:
+            self._logger.warning(
+                "NEEDS REVIEW: Match [%s] -> [%s] (score %d/100).",
+                name,
+                ship_name,
+                max_score,
+            )
+            return ship_id, True
+        self._logger.success(
+            "Mapped [%s] -> [%s] (score %d/100).",
             CustomLogger.LEVEL_DEBUG,
+            name,
+            ship_name,
+            max_score,
         )
-        return None
-
-    def _get_ship_id_by_name(self, s: str):
-        result = self._session.query(Ship).where(Ship.name == s).first()
-        if result is not None:
-            return result.id
-        else:
-            return None
+        return ship_id, False
 
     def get_rsi_standalones(self) -> List[Standalone]:
         """
@@ -477,15 +732,31 @@ class EntityManager:
         Returns:
             smallest datetime or None if none found
         """
-        result = (
-            self._session.query(func.max(UpdateLog.loaddate))
-            .filter_by(update_type=update_type)
-            .first()
+        return self._session.execute(
+            _LATEST_LOADDATE, {"update_type": update_type}
+        ).scalar()
+
+    def get_loaddates(self) -> Dict[UpdateType, datetime]:
+        """
+        Get latest update dates for all data types at once
+        Returns:
+            latest datetime per data type, types never updated are omitted
+        """
+        return dict(
+            self._session.query(UpdateLog.update_type, func.max(UpdateLog.loaddate))
+            .group_by(UpdateLog.update_type)
+            .all()
         )
-        if result is None:
-            return None
-        return result[0]
 
-    def __del__(self):
+    def close(self) -> None:
+        """
+        Closes the session and the underlying database connection
+        """
         self._session.close()
         self._engine.dispose()
+
+    def __enter__(self) -> "EntityManager":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
@@ -16,10 +16,10 @@ if __name__ == "__main__":
     logger = CustomLogger(__name__, logging.INFO)
 
     config = ConfigProvider(logger)
-    broker = SCDataBroker(logger, config)
-    broker.complete_update(False, True)
-    path = broker.get_upgrade_path(216, 150)
-    if path is not None:
-        path.full_print(logger)
-    else:
-        logger.info("No upgrade path found.")
+    with SCDataBroker(logger, config) as broker:
+        broker.complete_update(False, True)
+        path = broker.get_upgrade_path(216, 150)
+        if path is not None:
+            path.full_print(logger)
+        else:
+            logger.info("No upgrade path found.")
@@ -0,0 +1,122 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+
+from broker import SCDataBroker
+from config import ConfigProvider
+from db.entity import UpdateType, UpdateLog
+from util.helpers import CustomLogger
+
+_TEST_DATABASE_PATH = os.path.abspath("test_database.db")
+# scraped test data younger than this is reused instead of scraping again
+_TEST_DATABASE_MAX_AGE = timedelta(days=1)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="run slow tests scraping remote data",
+    )
+    parser.addoption(
+        "--refresh-db",
+        action="store_true",
+        default=False,
+        help="scrape remote data even if the cached test database is recent",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: test scrapes remote data")
+    config.addinivalue_line(
+        "markers", "serial: test shares files on disk and must not run in parallel"
+    )
+    config.addinivalue_line(
+        "markers", "populates_data: test scrapes remote data into the test database"
+    )
+    config.addinivalue_line(
+        "markers", "requires_data: test needs scraped data in the test database"
+    )
+
+
+# groups need to be assigned before xdist reads them to schedule the tests
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    if config.pluginmanager.hasplugin("xdist"):
+        # when run in parallel with "pytest -n auto --dist loadgroup", all serial tests
+        # share a worker while the others are spread across the remaining ones
+        serial_group = pytest.mark.xdist_group("serial")
+        for item in items:
+            if "serial" in item.keywords:
+                item.add_marker(serial_group)
+
+    run_slow = config.getoption("--run-slow")
+    data_recent = _is_test_database_recent()
+    # data is only scraped if slow tests run and the database isn't reused
+    populate_data = run_slow and (config.getoption("--refresh-db") or not data_recent)
+    skip_slow = pytest.mark.skip(reason="needs --run-slow to run")
+    skip_populate = pytest.mark.skip(
+        reason="test database is recent, needs --refresh-db to scrape again"
+    )
+    skip_requires_data = pytest.mark.skip(
+        reason="test database is empty or outdated, needs --run-slow to scrape data"
+    )
+    for item in items:
+        if "slow" in item.keywords and not run_slow:
+            item.add_marker(skip_slow)
+        elif "populates_data" in item.keywords and not populate_data:
+            item.add_marker(skip_populate)
+        elif "requires_data" in item.keywords and not (data_recent or populate_data):
+            item.add_marker(skip_requires_data)
+
+
+def _is_test_database_recent() -> bool:
+    if not os.path.exists(_TEST_DATABASE_PATH):
+        return False
+    # file modification times change on any write, rely on the logged updates instead.
+    # Read without an EntityManager, which would write to the database before any test
+    # runs by creating its tables and switching its journal mode. Managers checkpoint
+    # the database when closed, so it's read as immutable, leaving no WAL files behind.
+    database_uri = f"{Path(_TEST_DATABASE_PATH).as_uri()}?mode=ro&immutable=1"
+    engine = create_engine(
+        "sqlite://", creator=lambda: sqlite3.connect(database_uri, uri=True)
+    )
+    try:
+        with engine.connect() as connection:
+            loaddates = dict(
+                connection.execute(
+                    select(
+                        UpdateLog.update_type, func.max(UpdateLog.loaddate)
+                    ).group_by(UpdateLog.update_type)
+                ).all()
+            )
+    except OperationalError:
+        # update log table doesn't exist yet
+        return False
+    finally:
+        engine.dispose()
+    now = datetime.now()
+    return all(
+        update_type in loaddates
+        and now - loaddates[update_type] < _TEST_DATABASE_MAX_AGE
+        for update_type in UpdateType
+    )
+
+
+@pytest.fixture(scope="session")
+def logger():
+    return CustomLogger("test")
+
+
+@pytest.fixture(scope="session")
+def broker(logger):
+    # the database is kept after the session to be reused by following runs
+    broker = SCDataBroker(logger, ConfigProvider(logger), _TEST_DATABASE_PATH)
+    yield broker
+    broker.close()
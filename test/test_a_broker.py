@@ -1,24 +1,15 @@
 """Renamed to be executed first"""
-import os
-
 import pytest
 
 from broker import SCDataBroker
-from config import ConfigProvider
 from db.entity import Upgrade, Standalone
-from util.helpers import CustomLogger
-
 
-@pytest.fixture(scope="session")
-def broker():
-    logger = CustomLogger(__name__)
-    absolute_path = os.path.abspath("test_database.db")
-    broker = SCDataBroker(logger, ConfigProvider(logger), absolute_path)
-    yield broker
-    os.remove(absolute_path)
+pytestmark = [pytest.mark.serial, pytest.mark.requires_data]
 
 
 class TestSCDataBroker:
+    @pytest.mark.slow
+    @pytest.mark.populates_data
     def test_complete_update(self, broker: SCDataBroker):
         broker.complete_update(True)
 
@@ -1,10 +1,12 @@
+import pytest
+
 from data.analyze import PathAnalyzer
 from db.manager import EntityManager
-from util.helpers import CustomLogger
+
+pytestmark = [pytest.mark.serial, pytest.mark.requires_data]
 
 
-def test_path_analyzer():
-    logger = CustomLogger(__name__)
+def test_path_analyzer(logger):
     em = EntityManager(logger, "test_database.db")
     path_analyzer = PathAnalyzer(em, logger)
     assert path_analyzer.get_upgrade_path(1, 60) is None
@@ -1,10 +1,40 @@
+import os
+
+import pytest
+import requests
+
 from config import ConfigProvider
 from data.api import SCApi
-from util.helpers import CustomLogger
+
+pytestmark = pytest.mark.serial
+
+_SHIPS_FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "ships.json")
+
+
+@pytest.fixture
+def ships_response(monkeypatch) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    with open(_SHIPS_FIXTURE_PATH, "rb") as ships_file:
+        response._content = ships_file.read()
+    monkeypatch.setattr(requests, "get", lambda url: response)
+    return response
+
+
+def test_sc_api_ships(logger, ships_response):
+    ships = SCApi("dummy", logger).get_ships()
+    assert [ship.name for ship in ships] == ["Gladius", "300i", "Freelancer MAX"]
+    assert ships[0].manufacturer.id == 1
+    assert ships[0].manufacturer.name == "Aegis Dynamics"
+
+
+def test_sc_api_unsuccessful(logger, ships_response):
+    ships_response.status_code = 500
+    assert SCApi("dummy", logger).get_ships() == []
 
 
-def test_sc_api():
-    logger = CustomLogger(__name__)
+@pytest.mark.slow
+def test_sc_api(logger):
     config_provider = ConfigProvider(logger)
     sc_api = SCApi(config_provider.sc_api_key, logger)
     ships = sc_api.get_ships()
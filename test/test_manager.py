@@ -1,94 +1,153 @@
-from datetime import datetime
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
 
 import pytest
 
-from db.entity import UpdateType
+from db.entity import UpdateType, Manufacturer, Ship
 from db.manager import EntityManager
-from util.const import RSI_SCRAPER_STORE_OWNER, RSI_SCRAPER_STORE_URL
-from util.helpers import CustomLogger
+from util.const import (
+    RSI_SCRAPER_STORE_OWNER,
+    RSI_SCRAPER_STORE_URL,
+    SHIP_DATA_EXPIRY,
+)
 
-_logger = CustomLogger(__name__)
+pytestmark = pytest.mark.serial
 
 
-class TestEntityManager:
-    _EM = EntityManager(_logger, "test_database.db")
+@pytest.fixture(scope="module")
+def entity_manager(logger):
+    entity_manager = EntityManager(logger, "test_database.db")
+    yield entity_manager
+    entity_manager.close()
+
+
+@pytest.fixture
+def memory_entity_manager(logger):
+    # tests which do not depend on scraped data run against a private in-memory database
+    with EntityManager(logger, ":memory:") as entity_manager:
+        yield entity_manager
+
 
-    def test_find_store(self):
-        store = self._EM.find_store(RSI_SCRAPER_STORE_OWNER, RSI_SCRAPER_STORE_URL)
+class TestEntityManager:
+    def test_find_store(self, entity_manager):
+        store = entity_manager.find_store(
+            RSI_SCRAPER_STORE_OWNER, RSI_SCRAPER_STORE_URL
+        )
         assert store is not None
         assert store.url == RSI_SCRAPER_STORE_URL
         assert store.username == RSI_SCRAPER_STORE_OWNER
         assert store.upgrades is not None
 
-    def test_update_manufacturers(self):
-        assert self._EM.update_manufacturers([]) == 0
-        with pytest.raises(ValueError):
-            self._EM.update_manufacturers([1])
+    def test_find_stores(self, memory_entity_manager):
+        keys = [
+            (RSI_SCRAPER_STORE_OWNER, RSI_SCRAPER_STORE_URL),
+            ("test_store_owner", "https://example.com/test_store"),
+        ]
+        stores = memory_entity_manager.find_stores(keys)
+        assert stores.keys() == set(keys)
+        for (username, url), store in stores.items():
+            assert store.id is not None
+            assert store == memory_entity_manager.find_store(username, url)
+        assert memory_entity_manager.find_stores([]) == {}
 
-    def test_update_ships(self):
-        assert self._EM.update_ships([]) == 0
+    @pytest.mark.parametrize(
+        "method_name",
+        [
+            "update_manufacturers",
+            "update_ships",
+            "update_rsi_standalones",
+            "update_rsi_upgrades",
+            "update_reddit_standalones",
+            "update_reddit_upgrades",
+        ],
+    )
+    def test_update_entities(self, memory_entity_manager, method_name: str):
+        update_method = getattr(memory_entity_manager, method_name)
+        assert update_method([]) == 0
         with pytest.raises(ValueError):
-            self._EM.update_ships([1])
+            update_method([1])
 
-    def test_update_rsi_standalones(self):
-        assert self._EM.update_rsi_standalones([]) == 0
-        with pytest.raises(ValueError):
-            self._EM.update_rsi_standalones([1])
+    def test_update_ships(self, memory_entity_manager):
+        memory_entity_manager.update_manufacturers([Manufacturer(id=1, name="Anvil")])
 
-    def test_update_rsi_upgrades(self):
-        assert self._EM.update_rsi_upgrades([]) == 0
-        with pytest.raises(ValueError):
-            self._EM.update_rsi_upgrades([1])
+        def ship(id_: int, name: str, img_url: Optional[str] = None) -> Ship:
+            return Ship(id=id_, name=name, img_url_small=img_url, manufacturer_id=1)
 
-    def test_update_reddit_standalones(self):
-        assert self._EM.update_reddit_standalones([]) == 0
-        with pytest.raises(ValueError):
-            self._EM.update_reddit_standalones([1])
+        def stored_ships() -> Dict[int, Tuple[str, Optional[str]]]:
+            return {
+                s.id: (s.name, s.img_url_small)
+                for s in memory_entity_manager.get_ships()
+            }
 
-    def test_update_reddit_upgrades(self):
-        assert self._EM.update_reddit_upgrades([]) == 0
-        with pytest.raises(ValueError):
-            self._EM.update_reddit_upgrades([1])
+        # insert
+        assert memory_entity_manager.update_ships([ship(1, "Hornet", "small.jpg")]) == 1
+        assert stored_ships() == {1: ("Hornet", "small.jpg")}
+        # ships whose name exists already are ignored
+        assert memory_entity_manager.update_ships([ship(2, "Hornet")]) == 0
+        assert stored_ships() == {1: ("Hornet", "small.jpg")}
+        # update by id, attributes explicitly set to None are cleared
+        assert memory_entity_manager.update_ships([ship(1, "Super Hornet")]) == 1
+        assert stored_ships() == {1: ("Super Hornet", None)}
+        # stale ships are removed on the next update
+        memory_entity_manager._session.query(Ship).update(
+            {Ship.loaddate: datetime.now() - SHIP_DATA_EXPIRY - timedelta(days=1)}
+        )
+        assert memory_entity_manager.update_ships([ship(3, "Carrack")]) == 1
+        assert stored_ships() == {3: ("Carrack", None)}
 
-    def test_get_manufacturers(self):
-        manufacturers = self._EM.get_manufacturers()
+    @pytest.mark.requires_data
+    def test_get_manufacturers(self, entity_manager):
+        manufacturers = entity_manager.get_manufacturers()
         assert manufacturers is not None
         assert len(manufacturers) > 0
 
-    def test_get_ships(self):
-        ships = self._EM.get_ships()
+    @pytest.mark.requires_data
+    def test_get_ships(self, entity_manager):
+        ships = entity_manager.get_ships()
         assert ships is not None
         assert len(ships) > 0
 
-    def test_get_rsi_standalones(self):
-        rsi_standalones = self._EM.get_rsi_standalones()
+    def test_list_ship_rows(self, entity_manager):
+        ships = entity_manager.get_ships()
+        rows = entity_manager.list_ship_rows()
+        assert len(rows) == len(ships)
+        for ship in ships:
+            assert (ship.id, ship.name, ship.manufacturer.name) in rows
+
+    @pytest.mark.requires_data
+    def test_get_rsi_standalones(self, entity_manager):
+        rsi_standalones = entity_manager.get_rsi_standalones()
         assert rsi_standalones is not None
         assert len(rsi_standalones) > 0
 
-    def test_get_rsi_upgrades(self):
-        rsi_upgrades = self._EM.get_rsi_upgrades()
+    @pytest.mark.requires_data
+    def test_get_rsi_upgrades(self, entity_manager):
+        rsi_upgrades = entity_manager.get_rsi_upgrades()
         assert rsi_upgrades is not None
         assert len(rsi_upgrades) > 0
 
-    def test_get_reddit_standalones(self):
-        reddit_standalones = self._EM.get_reddit_standalones()
+    def test_get_reddit_standalones(self, entity_manager):
+        reddit_standalones = entity_manager.get_reddit_standalones()
         assert reddit_standalones is not None
 
-    def test_get_reddit_upgrades(self):
-        reddit_upgrades = self._EM.get_reddit_upgrades()
+    def test_get_reddit_upgrades(self, entity_manager):
+        reddit_upgrades = entity_manager.get_reddit_upgrades()
         assert reddit_upgrades is not None
 
-    def test_get_all_standalones(self):
-        standalones = self._EM.get_all_standalones(True)
+    @pytest.mark.requires_data
+    def test_get_all_standalones(self, entity_manager):
+        standalones = entity_manager.get_all_standalones(True)
         assert standalones is not None
         assert len(standalones) > 0
 
-    def test_get_all_upgrades(self):
-        upgrades = self._EM.get_all_upgrades(True)
+    @pytest.mark.requires_data
+    def test_get_all_upgrades(self, entity_manager):
+        upgrades = entity_manager.get_all_upgrades(True)
         assert upgrades is not None
         assert len(upgrades) > 0
 
-    def test_get_loaddate(self):
+    def test_get_loaddate(self, entity_manager):
         for update_type in [
             UpdateType.SHIPS,
             UpdateType.MANUFACTURERS,
@@ -97,10 +156,17 @@ class TestEntityManager:
             UpdateType.REDDIT_UPGRADES,
             UpdateType.REDDIT_STANDALONES,
         ]:
-            loaddate = self._EM.get_loaddate(update_type)
-            assert loaddate is None or type(loaddate) == datetime
+            loaddate = entity_manager.get_loaddate(update_type)
+            assert loaddate is None or isinstance(loaddate, datetime)
 
-    def test_find_ship_id_by_name(self):
+    def test_get_loaddates(self, entity_manager):
+        loaddates = entity_manager.get_loaddates()
+        for update_type, loaddate in loaddates.items():
+            assert isinstance(update_type, UpdateType)
+            assert loaddate == entity_manager.get_loaddate(update_type)
+
+    @pytest.mark.requires_data
+    def test_find_ship_id_by_name(self, entity_manager):
         exact_matches = ["Gladius", "300i", "890 Jump", "Caterpillar", "Freelancer MAX"]
         approximate_matches = [
             "Aegis Gladius",
@@ -119,11 +185,81 @@ class TestEntityManager:
             "999 Joint",
         ]
         for x in exact_matches + approximate_matches:
-            ship_id, needs_review = self._EM.find_ship_id_by_name(x)
+            ship_id, needs_review = entity_manager.find_ship_id_by_name(x)
             assert ship_id is not None
             assert needs_review is not None
             assert ship_id > 0
-            assert type(needs_review) == bool
+            assert type(needs_review) is bool
         for x in no_matches:
-            return_val = self._EM.find_ship_id_by_name(x)
+            return_val = entity_manager.find_ship_id_by_name(x)
             assert return_val is None
+
+    def test_find_ship_id_by_name_in_memory(self, memory_entity_manager):
+        manufacturers = {
+            1: "Anvil Aerospace",
+            2: "Aegis Dynamics",
+            3: "Drake Interplanetary",
+            4: "Origin Jumpworks",
+        }
+        ships = {
+            1: ("F7C Hornet", 1),
+            2: ("F7C-M Super Hornet", 1),
+            3: ("Carrack", 1),
+            4: ("Gladius", 2),
+            5: ("Avenger Titan", 2),
+            6: ("Sabre", 2),
+            7: ("Cutlass Black", 3),
+            8: ("Cutlass Red", 3),
+            9: ("Caterpillar", 3),
+            10: ("600i Touring", 4),
+            11: ("600i Explorer", 4),
+            12: ("300i", 4),
+        }
+        memory_entity_manager.update_manufacturers(
+            [Manufacturer(id=id_, name=name) for id_, name in manufacturers.items()]
+        )
+        memory_entity_manager.update_ships(
+            [
+                Ship(
+                    id=id_,
+                    name=name,
+                    manufacturer_id=manufacturer_id,
+                    manufacturer=Manufacturer(
+                        id=manufacturer_id, name=manufacturers[manufacturer_id]
+                    ),
+                )
+                for id_, (name, manufacturer_id) in ships.items()
+            ]
+        )
+        expected_results = {
+            "Anvil": None,
+            "Aegis": None,
+            "Drake": None,
+            "Gladius": (4, False),
+            "Aegis Gladius": (4, False),
+            "Origin 300i": (12, False),
+            "Catterpillar": (9, False),
+            "Super Hornet": (2, False),
+            # scores 89.66, rounded to a whole score like fuzzywuzzy's
+            "Avyaenger cTitan": (5, False),
+            # Latin-1 characters are dropped before scoring, like fuzzywuzzy did
+            "300éi": (12, False),
+            # ambiguous ship names need to be reviewed
+            "Drake Cutlass": (8, True),
+            "Anvil Hornet": (1, True),
+            "Origin 600i": (10, True),
+            # manufacturers aren't matched, only ship names
+            "Aegis Sabr": None,
+            "Simple non-match": None,
+        }
+        for name, expected_result in expected_results.items():
+            assert memory_entity_manager.find_ship_id_by_name(name) == expected_result
+
+    def test_context_manager(self, logger):
+        with EntityManager(logger, ":memory:") as entity_manager:
+            assert entity_manager.get_loaddates() is not None
+            connection = entity_manager._session.connection().connection
+            dbapi_connection = connection.dbapi_connection
+        # the engine is disposed, closing its pooled connection
+        with pytest.raises(sqlite3.ProgrammingError):
+            dbapi_connection.execute("SELECT 1")
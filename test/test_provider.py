@@ -30,11 +30,12 @@ def test_expiry_not_expired():
     assert expired.expires_in() == format_timedelta(timedelta(minutes=0, seconds=1))
 
 
+@pytest.mark.serial
 class TestDataProviderManager:
-    _DPM = DataProviderManager()
-
-    def test_add_data_provider(self):
-        logger = CustomLogger(__name__)
+    @staticmethod
+    def _add_data_providers(
+        data_provider_manager: DataProviderManager, logger: CustomLogger
+    ) -> None:
         ship_data_provider = ShipDataProvider([], datetime.now(), logger)
         official_standalone_data_provider = OfficialStandaloneDataProvider(
             [], ship_data_provider, datetime.now(), logger
@@ -42,33 +43,56 @@ class TestDataProviderManager:
         official_upgrade_data_provider = OfficialUpgradeDataProvider(
             [], ship_data_provider, datetime.now(), logger
         )
-        self._DPM.add_data_provider(DataProviderType.SHIPS, ship_data_provider)
-        self._DPM.add_data_provider(
+        data_provider_manager.add_data_provider(
+            DataProviderType.SHIPS, ship_data_provider
+        )
+        data_provider_manager.add_data_provider(
             DataProviderType.RSI_STANDALONES, official_standalone_data_provider
         )
-        self._DPM.add_data_provider(
+        data_provider_manager.add_data_provider(
             DataProviderType.RSI_UPGRADES, official_upgrade_data_provider
         )
 
-    def test_get_data_provider(self):
-        ship_data_provider = self._DPM.get_data_provider(DataProviderType.SHIPS)
+    @pytest.fixture
+    def data_provider_manager(self, logger) -> DataProviderManager:
+        data_provider_manager = DataProviderManager()
+        self._add_data_providers(data_provider_manager, logger)
+        return data_provider_manager
+
+    def test_add_data_provider(self, logger):
+        data_provider_manager = DataProviderManager()
+        self._add_data_providers(data_provider_manager, logger)
+        with pytest.raises(ValueError):
+            data_provider_manager.add_data_provider(
+                DataProviderType.SHIPS, ShipDataProvider([], datetime.now(), logger)
+            )
+
+    def test_get_data_provider(self, data_provider_manager):
+        ship_data_provider = data_provider_manager.get_data_provider(
+            DataProviderType.SHIPS
+        )
         assert ship_data_provider is not None
-        assert type(ship_data_provider) == ShipDataProvider
-        official_standalone_data_provider = self._DPM.get_data_provider(
+        assert isinstance(ship_data_provider, ShipDataProvider)
+        official_standalone_data_provider = data_provider_manager.get_data_provider(
             DataProviderType.RSI_STANDALONES
         )
         assert official_standalone_data_provider is not None
-        assert type(official_standalone_data_provider) == OfficialStandaloneDataProvider
-        official_upgrade_data_provider = self._DPM.get_data_provider(
+        assert isinstance(
+            official_standalone_data_provider, OfficialStandaloneDataProvider
+        )
+        official_upgrade_data_provider = data_provider_manager.get_data_provider(
             DataProviderType.RSI_UPGRADES
         )
         assert official_upgrade_data_provider is not None
-        assert type(official_upgrade_data_provider) == OfficialUpgradeDataProvider
+        assert isinstance(official_upgrade_data_provider, OfficialUpgradeDataProvider)
         with pytest.raises(ValueError):
-            self._DPM.get_data_provider(DataProviderType.REDDIT_ENTRIES)
+            data_provider_manager.get_data_provider(DataProviderType.REDDIT_ENTRIES)
 
-    def test_get_data_provider_data(self):
-        ship_data_provider = self._DPM.get_data_provider(DataProviderType.SHIPS)
+    @pytest.mark.slow
+    def test_get_data_provider_data(self, data_provider_manager):
+        ship_data_provider = data_provider_manager.get_data_provider(
+            DataProviderType.SHIPS
+        )
         data, updated = ship_data_provider.get_data(True, False)
         assert data is not None
         assert len(data) > 0
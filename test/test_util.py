@@ -10,15 +10,44 @@ def test_format_timedelta():
     assert format_timedelta(delta2) == "1 days, 00:00:00"
     delta3 = timedelta(days=3, hours=4, minutes=59)
     assert format_timedelta(delta3) == "3 days"  # remove hours when more days than x
+    delta4 = timedelta(seconds=86399, microseconds=700000)
+    assert format_timedelta(delta4) == "1 days, 00:00:00"  # rounded up to next day
+    delta5 = timedelta(seconds=3599, microseconds=400000)
+    assert format_timedelta(delta5) == "00:59:59"
 
 
 def test_custom_logger():
     logger = CustomLogger(__name__)
     logger.log("fuuf")
     logger.log("fuuf", CustomLogger.LEVEL_WARN)
+    logger.log("%s fuuf", CustomLogger.LEVEL_ERR, "lazy")
     logger.info("feef")
     logger.warning("soos")
     logger.error("meem")
     logger.info(5)
     logger.info(5.2)
     logger.info(CustomLogger("testObjectPrint"))
+    logger.info("%s feef %d", "lazy", 5)
+    logger.success("soos %s", CustomLogger.LEVEL_INFO, 5.2)
+
+
+def test_custom_logger_independent_levels(capsys):
+    debug_logger = CustomLogger("test_independent_levels", CustomLogger.LEVEL_DEBUG)
+    info_logger = CustomLogger("test_independent_levels", CustomLogger.LEVEL_INFO)
+    # instances sharing a name keep their own level
+    debug_logger.debug("shown")
+    info_logger.debug("hidden")
+    err = capsys.readouterr().err
+    assert "shown" in err
+    assert "hidden" not in err
+
+
+def test_custom_logger_writes_immediately(capsys):
+    logger = CustomLogger("test_writes_immediately")
+    # records are written to the current stderr as soon as they are logged
+    logger.header_start("block", CustomLogger.LEVEL_INFO)
+    assert "block" in capsys.readouterr().err
+    logger.info("progress")
+    assert "progress" in capsys.readouterr().err
+    logger.header_end(CustomLogger.LEVEL_INFO)
+    assert "DONE" in capsys.readouterr().err
@@ -1,6 +1,6 @@
 """Contains constants used application-wide"""
 from datetime import timedelta
-from math import floor
+from math import floor, ceil
 
 DATABASE_FILEPATH = "database.db"
 CONFIG_FILEPATH = "config.ini"
@@ -67,8 +67,7 @@ lower values cause higher offsets for shorter queries"""
 _FUZZY_SEARCH_LENGTH_OFFSET_FACTOR = 0.3
 
 
-def fuzzy_search_min_score(length: int) -> int:
-    """The higher the length, the higher the min score"""
+def _compute_fuzzy_search_min_score(length: int) -> int:
     return _FUZZY_SEARCH_MIN_SCORE_BASE - (
         10
         - min(
@@ -76,3 +75,20 @@ def fuzzy_search_min_score(length: int) -> int:
             _FUZZY_SEARCH_MIN_SCORE_MAX_OFFSET,
         )
     )
+
+
+# min scores stop changing once the max offset is reached, precompute them up to there
+_FUZZY_SEARCH_MIN_SCORES = tuple(
+    _compute_fuzzy_search_min_score(length)
+    for length in range(
+        ceil(_FUZZY_SEARCH_MIN_SCORE_MAX_OFFSET / _FUZZY_SEARCH_LENGTH_OFFSET_FACTOR)
+        + 1
+    )
+)
+
+
+def fuzzy_search_min_score(length: int) -> int:
+    """The higher the length, the higher the min score"""
+    return _FUZZY_SEARCH_MIN_SCORES[
+        min(max(length, 0), len(_FUZZY_SEARCH_MIN_SCORES) - 1)
+    ]
@@ -1,9 +1,10 @@
 """Provides utility classes and functions"""
 import logging
+import os
 import shutil
+import sys
 from datetime import timedelta
-from logging import Logger
-from math import floor, ceil
+from functools import lru_cache
 from typing import Any
 
 from colorama import init, Fore, Style, Back
@@ -18,23 +19,70 @@ def format_timedelta(delta: timedelta) -> str:
     Returns:
         formatted string from timedelta
     """
-    output_str = ""
-    total_seconds = delta.total_seconds()
-    if delta.days > 0:
-        if delta.days > 2:
-            return f"{delta.days} days"
-        else:
-            output_str += f"{delta.days} days, "
-    total_seconds -= delta.days * 86400
-    hours = str(round(total_seconds // 3600)).zfill(2)
-    minutes = str(round((total_seconds % 3600) // 60)).zfill(2)
-    seconds = str(round(total_seconds % 60)).zfill(2)
+    # round to the nearest second before splitting off days, so rounding up can't
+    # produce a time of 24:00:00
+    total_seconds = delta.days * 86400 + delta.seconds + (delta.microseconds >= 500000)
+    days, remainder = divmod(total_seconds, 86400)
+    if days > 2:
+        return f"{days} days"
+    hours, remainder = divmod(remainder, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{days} days, {time_str}" if days > 0 else time_str
+
+
+# ANSI color sequences are constant, so build each level's prefix only once
+_DEBUG_PREFIX = Fore.BLACK
+_INFO_PREFIX = Back.BLACK + Fore.WHITE
+_WARNING_PREFIX = Back.YELLOW + Fore.BLACK
+_ERROR_PREFIX = Back.RED + Fore.WHITE
+_SUCCESS_PREFIX = Back.BLACK + Fore.GREEN
+_FAILURE_PREFIX = Back.BLACK + Fore.RED
+_HEADER_PREFIX = Back.GREEN + Fore.BLACK
+_RESET = Style.RESET_ALL
+
+
+@lru_cache(maxsize=64)
+def _format_header(s: str, console_width: int) -> str:
+    padding = console_width - len(s)
+    padded_char_count_left = padding // 2 - 1
+    padded_char_count_right = (padding + 1) // 2 - 1
+    msg = f"{'#' * padded_char_count_left} {s} {'#' * padded_char_count_right}"
+    return f"{_HEADER_PREFIX}{msg}{_RESET}"
+
+
+@lru_cache(maxsize=None)
+def _console_width() -> int:
+    # read once instead of once per header, a console resized during a run keeps
+    # getting headers of its former width
+    return shutil.get_terminal_size().columns
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """
+    Writes records to the current stderr
+    """
+
+    @property
+    def stream(self):
+        # looked up on every write so replaced or redirected streams are respected
+        return sys.stderr
 
-    output_str += f"{hours}:{minutes}:{seconds}"
-    return output_str
+    @stream.setter
+    def stream(self, _):
+        pass
 
 
-init(strip=False)
+# shared by all loggers
+_CONSOLE_HANDLER = _ConsoleHandler()
+
+
+@lru_cache(maxsize=None)
+def _init_console() -> None:
+    # colorama only needs to wrap stdout/stderr to translate ANSI sequences for
+    # Windows consoles, other terminals get the sequences as they are
+    if os.name == "nt":
+        init(strip=False)
 
 
 class CustomLogger:
@@ -44,49 +92,64 @@ class CustomLogger:
     LEVEL_ERR = logging.ERROR
 
     def __init__(self, name: str, level: int = LEVEL_INFO):
-        self._logger = Logger(name)
-        self._logger.setLevel(level)
-        self._logger.addHandler(logging.StreamHandler())
-
-    def log(self, s: Any, level: int = LEVEL_INFO):
+        _init_console()
+        # loggers are shared by name, only attach the console handler once so repeated
+        # instances don't write every record multiple times. Each instance filters by
+        # its own level, so the shared logger lets all records pass.
+        self._level = level
+        self._logger = logging.getLogger(name)
+        self._logger.propagate = False
+        if not self._logger.handlers:
+            self._logger.setLevel(logging.DEBUG)
+            self._logger.addHandler(_CONSOLE_HANDLER)
+        # bound once, looked up on every log call otherwise
+        self._log = self._logger.log
+
+    def _is_enabled_for(self, level: int) -> bool:
+        return level >= self._level
+
+    def log(self, s: Any, level: int = LEVEL_INFO, *args: Any):
         if level == self.LEVEL_DEBUG:
-            self.debug(s)
+            self.debug(s, *args)
         elif level == self.LEVEL_INFO:
-            self.info(s)
+            self.info(s, *args)
         elif level == self.LEVEL_WARN:
-            self.warning(s)
+            self.warning(s, *args)
         elif level == self.LEVEL_ERR:
-            self.error(s)
+            self.error(s, *args)
 
-    def debug(self, s: Any):
-        self._logger.debug(Fore.BLACK + str(s) + Style.RESET_ALL)
+    def debug(self, s: Any, *args: Any):
+        if self._is_enabled_for(logging.DEBUG):
+            self._log(logging.DEBUG, f"{_DEBUG_PREFIX}{s}{_RESET}", *args)
 
-    def _header(self, s: str, level: int):
-        s_len = len(s)
-        console_width = shutil.get_terminal_size().columns
-        padded_char_count_left = floor((console_width - s_len) / 2) - 1
-        padded_char_count_right = ceil((console_width - s_len) / 2) - 1
-        msg = f"{'#' * padded_char_count_left} {str(s)} {'#' * padded_char_count_right}"
-        self._logger.log(level, Back.GREEN + Fore.BLACK + msg + Style.RESET_ALL)
+    def _header(self, s: str, level: int, prefix: str = ""):
+        if not self._is_enabled_for(level):
+            return
+        self._log(level, prefix + _format_header(s, _console_width()))
 
     def header_start(self, s: Any, level: int):
-        self._logger.log(level, "\n")
-        self._header(str(s), level)
+        # the blank lines separating sections are part of the header record
+        self._header(str(s), level, "\n\n")
 
     def header_end(self, level: int):
         self._header("DONE", level)
 
-    def success(self, s: Any, level: int):
-        self._logger.log(level, Back.BLACK + Fore.GREEN + str(s) + Style.RESET_ALL)
+    def success(self, s: Any, level: int, *args: Any):
+        if self._is_enabled_for(level):
+            self._log(level, f"{_SUCCESS_PREFIX}{s}{_RESET}", *args)
 
-    def failure(self, s: Any, level: int):
-        self._logger.log(level, Back.BLACK + Fore.RED + str(s) + Style.RESET_ALL)
+    def failure(self, s: Any, level: int, *args: Any):
+        if self._is_enabled_for(level):
+            self._log(level, f"{_FAILURE_PREFIX}{s}{_RESET}", *args)
 
-    def info(self, s: Any):
-        self._logger.info(Back.BLACK + Fore.WHITE + str(s) + Style.RESET_ALL)
+    def info(self, s: Any, *args: Any):
+        if self._is_enabled_for(logging.INFO):
+            self._log(logging.INFO, f"{_INFO_PREFIX}{s}{_RESET}", *args)
 
-    def warning(self, s: Any):
-        self._logger.warning(Back.YELLOW + Fore.BLACK + str(s) + Style.RESET_ALL)
+    def warning(self, s: Any, *args: Any):
+        if self._is_enabled_for(logging.WARNING):
+            self._log(logging.WARNING, f"{_WARNING_PREFIX}{s}{_RESET}", *args)
 
-    def error(self, s: Any):
-        self._logger.error(Back.RED + Fore.WHITE + str(s) + Style.RESET_ALL)
+    def error(self, s: Any, *args: Any):
+        if self._is_enabled_for(logging.ERROR):
+            self._log(logging.ERROR, f"{_ERROR_PREFIX}{s}{_RESET}", *args)